@@ -0,0 +1,60 @@
+"""Add archive_segments and operation_summaries tables
+
+Revision ID: 4ab33b56b3e4
+Revises: 4f1b7e2d9a60
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4ab33b56b3e4'
+down_revision = '4f1b7e2d9a60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('archive_segments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('path', sa.Text(), nullable=False),
+    sa.Column('min_date', sa.Date(), nullable=False),
+    sa.Column('max_date', sa.Date(), nullable=False),
+    sa.Column('rows', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('fk_archive_segments_user_id_users')),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_archive_segments')),
+    sa.UniqueConstraint('path', name=op.f('uq_archive_segments_path'))
+    )
+    op.create_table('operation_summaries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('amount_minor', sa.BigInteger(), nullable=False),
+    sa.Column('amount_base_minor', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name=op.f('fk_operation_summaries_user_id_users')),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_operation_summaries')),
+    sa.UniqueConstraint('user_id', 'year', 'kind', 'currency', name=op.f('uq_operation_summaries_user_id'))
+    )
+    # SQLite reuses the max id after it is deleted, AUTOINCREMENT does not: ids of
+    # archived operations must not be given to new ones
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table('operations', recreate='always',
+                                  table_kwargs={'sqlite_autoincrement': True}):
+            pass
+    op.create_index('ix_operations_user_id_date', 'operations', ['user_id', 'date'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_operations_user_id_date', table_name='operations')
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table('operations', recreate='always'):
+            pass
+    op.drop_table('operation_summaries')
+    op.drop_table('archive_segments')
@@ -0,0 +1,46 @@
+"""Add currency to operations and fx_rates table
+
+Revision ID: 4f1b7e2d9a60
+Revises: 9c0952065f6d
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.accounts.settings import settings  # pylint: disable=import-error,no-name-in-module
+
+
+# revision identifiers, used by Alembic.
+revision = '4f1b7e2d9a60'
+down_revision = '9c0952065f6d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('fx_rates',
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('rate', sa.Numeric(precision=18, scale=8), nullable=False),
+    sa.PrimaryKeyConstraint('date', 'currency', name=op.f('pk_fx_rates'))
+    )
+    op.create_table('fx_rates_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_fx_rates_version'))
+    )
+    with op.batch_alter_table('operations') as batch_op:
+        batch_op.add_column(sa.Column('currency', sa.String(length=3), nullable=True))
+    # existing operations are in base currency
+    op.execute(
+        sa.text('UPDATE operations SET currency = :currency')
+        .bindparams(currency=settings.base_currency)
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('operations') as batch_op:
+        batch_op.drop_column('currency')
+    op.drop_table('fx_rates_version')
+    op.drop_table('fx_rates')
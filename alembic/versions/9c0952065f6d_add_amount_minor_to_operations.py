@@ -0,0 +1,32 @@
+"""Add amount_minor to operations
+
+Revision ID: 9c0952065f6d
+Revises: 82ebf799b7f7
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c0952065f6d'
+down_revision = '82ebf799b7f7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('operations') as batch_op:
+        batch_op.add_column(sa.Column('amount_minor', sa.BigInteger(), nullable=True))
+    # amounts are stored with scale 2, so minor units are cents
+    op.execute(
+        'UPDATE operations '
+        'SET amount_minor = CAST(ROUND(amount * 100) AS BIGINT) '
+        'WHERE amount IS NOT NULL'
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('operations') as batch_op:
+        batch_op.drop_column('amount_minor')
@@ -0,0 +1,105 @@
+"""Aggregation of amounts and API responses: Decimal vs integer minor units.
+
+Uses in-memory SQLite database filled with synthetic operations. Endpoints are
+timed through the app, with the same conversion to Decimal at the API boundary
+and the same serialization as real requests.
+
+    python benchmarks/money.py --operations 200000
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# pylint: disable=wrong-import-position
+from src.accounts import tables
+from src.accounts.app import app
+from src.accounts.database import get_session
+from src.accounts.services.operations import OperationsServices
+from src.accounts.settings import settings
+
+
+def fill(session: Session, operations: int) -> None:
+    """Insert synthetic operations
+
+    Args:
+        session (Session): database session
+        operations (int): number of operations
+    """
+    rnd = random.Random(0)
+    rows = []
+    for _ in range(operations):
+        amount_minor = rnd.randint(1, 1_000_000)
+        rows.append({
+            'date': date(2021, 1, 1) + timedelta(days=rnd.randrange(365)),
+            'kind': rnd.choice(('income', 'outcome')),
+            'amount': Decimal(amount_minor) / 100,
+            'amount_minor': amount_minor,
+        })
+    session.execute(tables.Operation.__table__.insert(), rows)
+    session.commit()
+
+
+def timeit(func: Callable, runs: int) -> float:
+    """Best time of `runs` calls, seconds"""
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--operations', type=int, default=200_000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    # one connection, so the in-memory database is shared with the app
+    engine = create_engine(
+        'sqlite://',
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool,
+    )
+    tables.Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        fill(session, args.operations)
+
+    def get_test_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_test_session
+    client = TestClient(app)
+
+    for minor_units in (False, True):
+        settings.money_minor_units = minor_units
+        with Session(engine) as session:
+            service = OperationsServices(session)
+            rows = service.get_list(fields=['amount'])
+            sql_sum = timeit(service.get_balance, args.runs)
+        python_sum = timeit(lambda: sum(row['amount'] for row in rows), args.runs)
+        balance = timeit(lambda: client.get('/operstions/balance'), args.runs)
+        listing = timeit(lambda: client.get('/operstions/?fields=id,amount'), args.runs)
+        print(f'{"minor units" if minor_units else "decimal    "}: '
+              f'SQL sum {sql_sum * 1000:7.1f} ms, '
+              f'python sum {python_sum * 1000:6.1f} ms, '
+              f'GET balance {balance * 1000:7.1f} ms, '
+              f'GET list {listing * 1000:7.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
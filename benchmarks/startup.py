@@ -0,0 +1,102 @@
+"""Cold start benchmark: import time and time to first response of the app.
+
+Every run starts a fresh interpreter with its own temporary SQLite database,
+so nothing is cached between runs. The first request is sign-up: it creates
+the engine, opens a session and loads bcrypt and jose, which are all lazy.
+Exit code is 1 if median time is over budget.
+
+    python benchmarks/startup.py --runs 10 --import-budget 0.7 --response-budget 0.6
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+# pylint: disable=wrong-import-position
+from src.accounts.tables import Base
+
+# Executed in a fresh interpreter, prints timings as json
+CHILD = '''
+import json, time
+start = time.perf_counter()
+from src.accounts.app import app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    ready = time.perf_counter()
+    response = client.post('/auth/sign-up', json={
+        'email': 'user@example.com', 'username': 'user', 'password': 'password'})
+    responded = time.perf_counter()
+    assert response.status_code == 200, response.text
+print(json.dumps({
+    'import': imported - start,
+    'first_response': responded - ready,
+}))
+'''
+
+
+def run_once() -> dict[str, float]:
+    """Create empty database, start interpreter, import app and make first request
+
+    Returns:
+        dict[str, float]: timings in seconds
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f'sqlite:///{Path(directory) / "database.sqlite3"}'
+        engine = create_engine(database_url)
+        Base.metadata.create_all(engine)
+        engine.dispose()
+
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-c', CHILD],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+            env={**os.environ, 'DATABASE_URL': database_url},
+        )
+        process = time.perf_counter() - start
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings['process'] = process
+    return timings
+
+
+def main() -> int:
+    """Run benchmark and check budgets
+
+    Returns:
+        int: exit code
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--import-budget', type=float, default=0.7,
+                        help='max median import time, seconds')
+    parser.add_argument('--response-budget', type=float, default=0.6,
+                        help='max median time to first response, seconds')
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    medians = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+    for key, value in medians.items():
+        print(f'{key:>15}: {value * 1000:8.1f} ms (median of {args.runs})')
+
+    failed = False
+    for key, budget in (('import', args.import_budget),
+                        ('first_response', args.response_budget)):
+        if medians[key] > budget:
+            print(f'{key} is over budget: {medians[key]:.3f}s > {budget:.3f}s')
+            failed = True
+    return int(failed)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
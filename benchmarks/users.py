@@ -0,0 +1,131 @@
+"""Sign-in latency and user-join latency with users cache on and off.
+
+Uses in-memory SQLite database filled with synthetic users and operations.
+Passwords are hashed with default bcrypt cost, as in production. Sign-in does
+not use the cache (password is always checked against database), so it is
+measured once: it shows that bcrypt, not lookup, is the cost of sign-in.
+
+    python benchmarks/users.py --users 1000 --operations 20000
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# pylint: disable=wrong-import-position
+from src.accounts import tables
+from src.accounts.models.auth import User as ModelsUser
+from src.accounts.money import from_minor_units
+from src.accounts.services.auth import AuthService
+from src.accounts.services.users import UserLoader, users_cache
+from src.accounts.settings import settings
+
+
+def fill(session: Session, users: int, operations: int) -> None:
+    """Insert synthetic users and operations
+
+    Args:
+        session (Session): database session
+        users (int): number of users
+        operations (int): number of operations
+    """
+    rnd = random.Random(0)
+    # the same hash for all users: hashing is as slow as verification
+    password_hash = AuthService.hash_password('password')
+    session.execute(tables.User.__table__.insert(), [
+        {'id': i, 'email': f'user{i}@example.com', 'username': f'user{i}',
+         'password_hash': password_hash}
+        for i in range(1, users + 1)
+    ])
+    rows = []
+    for _ in range(operations):
+        amount_minor = rnd.randint(1, 10000)
+        rows.append({
+            'user_id': rnd.randint(1, users),
+            'date': date(2021, 1, 1) + timedelta(days=rnd.randrange(365)),
+            'kind': 'outcome',
+            'amount': from_minor_units(amount_minor),
+            'amount_minor': amount_minor,
+        })
+    session.execute(tables.Operation.__table__.insert(), rows)
+    session.commit()
+
+
+def bench_sign_in(session: Session, users: int, runs: int) -> float:
+    """Mean sign-in time, seconds"""
+    service = AuthService(session)
+    rnd = random.Random(1)
+    start = time.perf_counter()
+    for _ in range(runs):
+        service.authentificate_user(f'user{rnd.randint(1, users)}', 'password')
+    return (time.perf_counter() - start) / runs
+
+
+def bench_join_per_row(session: Session) -> float:
+    """Time to attach users to all operations by one lookup per row, seconds"""
+    start = time.perf_counter()
+    operations = session.query(tables.Operation).all()
+    for operation in operations:
+        user = users_cache.get_by_id(operation.user_id)
+        if user is None:
+            # query, not session.get: identity map would skip the database
+            row = (
+                session
+                .query(tables.User)
+                .filter_by(id=operation.user_id)
+                .first()
+            )
+            user = ModelsUser.from_orm(row)
+            users_cache.set(user)
+    return time.perf_counter() - start
+
+
+def bench_join_loader(session: Session) -> float:
+    """Time to attach users to all operations by `UserLoader`, seconds"""
+    start = time.perf_counter()
+    operations = session.query(tables.Operation).all()
+    users = UserLoader(session).load_many(op.user_id for op in operations)
+    for operation in operations:
+        users.get(operation.user_id)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--operations', type=int, default=20000)
+    parser.add_argument('--sign-ins', type=int, default=10)
+    args = parser.parse_args()
+
+    engine = create_engine('sqlite://')
+    tables.Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        fill(session, args.users, args.operations)
+
+    with Session(engine) as session:
+        sign_in = bench_sign_in(session, args.users, args.sign_ins)
+    print(f'sign-in {sign_in * 1000:7.2f} ms (default bcrypt cost)')
+
+    for enabled in (False, True):
+        settings.user_cache_enabled = enabled
+        users_cache.clear()
+        with Session(engine) as session:
+            per_row = bench_join_per_row(session)
+        users_cache.clear()
+        with Session(engine) as session:
+            loader = bench_join_loader(session)
+        print(f'cache {"on " if enabled else "off"}: '
+              f'join per row {per_row * 1000:8.1f} ms, '
+              f'join by loader {loader * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
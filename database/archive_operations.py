@@ -0,0 +1,57 @@
+"""Move old operations to compressed archive files.
+
+Operations before cutoff are written to new zstd compressed NDJSON files in
+settings.archive_dir (one file per user and year on each run), their sums are
+added to yearly summaries in `operation_summaries` and they are deleted from
+`operations`. Exchange rates for archived currencies must be loaded before.
+Run from the repository root:
+
+    python -m database.archive_operations --before 2021-01-01
+"""
+import argparse
+import sys
+from datetime import date, timedelta
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+
+from src.accounts.database import Session
+from src.accounts.services.archive import ArchiveService
+from src.accounts.settings import settings
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Archive operations
+
+    Args:
+        argv (Optional[list[str]], optional): command line arguments.
+        Defaults to None.
+
+    Returns:
+        int: exit code
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', default=settings.database_url)
+    parser.add_argument('--archive-dir', default=settings.archive_dir)
+    parser.add_argument('--before', type=date.fromisoformat,
+                        help='archive operations before this date, by default '
+                             'ARCHIVE_AFTER_DAYS days before today')
+    args = parser.parse_args(argv)
+
+    before = args.before or date.today() - timedelta(days=settings.archive_after_days)
+    settings.archive_dir = args.archive_dir
+    session = Session(bind=create_engine(args.database_url))
+    try:
+        archived = ArchiveService(session).archive(before)
+    except HTTPException as exception:
+        print(exception.detail, file=sys.stderr)
+        return 1
+    finally:
+        session.close()
+    print(f'{archived} operations before {before} archived to {args.archive_dir}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
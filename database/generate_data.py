@@ -0,0 +1,290 @@
+"""Generate synthetic users and operations for load tests.
+
+Deterministic by seed, rows are generated and inserted in batches, so memory
+does not depend on number of rows. Run from the repository root:
+
+    python -m database.generate_data --users 1000 --operations 1000000 --seed 42
+"""
+import argparse
+import math
+import random
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import accumulate
+from typing import Iterator, Optional
+
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.engine import Connection, Engine
+
+from src.accounts import tables
+from src.accounts.money import MINOR_UNITS
+from src.accounts.services.auth import AuthService
+from src.accounts.services.fx import bump_fx_rates_version
+from src.accounts.settings import settings
+
+
+INCOME_SHARE = 0.15
+# max of Numeric(10, 2) in minor units
+MAX_AMOUNT_MINOR = 10 ** 10 - 1
+
+INCOME_DESCRIPTIONS = ['Зарплата', 'Аванс', 'Премия', 'Кэшбэк', 'Проценты по вкладу']
+OUTCOME_DESCRIPTIONS = [
+    'Продукты', 'Ресторан', 'Транспорт', 'Такси', 'Коммунальные услуги', 'Связь',
+    'Аптека', 'Одежда', 'Кино', 'Подписки', 'Подарки', 'Путешествия',
+]
+# share of operations without description
+NO_DESCRIPTION_SHARE = 0.3
+# share of operations in base currency, the rest are split between other ones
+BASE_CURRENCY_SHARE = 0.9
+
+
+def set_sqlite_pragmas(engine: Engine) -> None:
+    """Trade durability for speed of bulk loading into SQLite
+
+    Args:
+        engine (Engine): engine to tune connections of
+    """
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, _):  # pylint: disable=unused-variable
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode = MEMORY')
+        cursor.execute('PRAGMA synchronous = OFF')
+        cursor.execute('PRAGMA temp_store = MEMORY')
+        cursor.execute('PRAGMA cache_size = -262144')  # 256 MiB
+        cursor.close()
+
+
+def generate_users(rnd: random.Random,
+                   first_id: int,
+                   count: int,
+                   password_hash: str,
+                   ) -> Iterator[dict]:
+    """Generate users with the same password
+
+    Args:
+        rnd (random.Random): random generator
+        first_id (int): id of the first user
+        count (int): number of users
+        password_hash (str): hash of users password
+
+    Yields:
+        Iterator[dict]: rows of `users` table
+    """
+    for user_id in range(first_id, first_id + count):
+        suffix = rnd.getrandbits(32)
+        yield {
+            'id': user_id,
+            'email': f'user{user_id}.{suffix:08x}@example.com',
+            'username': f'user{user_id}',
+            'password_hash': password_hash,
+        }
+
+
+def generate_fx_rates(rnd: random.Random,
+                      currencies: list[str],
+                      start: date,
+                      end: date,
+                      ) -> Iterator[dict]:
+    """Generate daily rates of currencies other than base one as random walk
+
+    Args:
+        rnd (random.Random): random generator
+        currencies (list[str]): currencies
+        start (date): first date
+        end (date): last date
+
+    Yields:
+        Iterator[dict]: rows of `fx_rates` table
+    """
+    for currency in currencies:
+        if currency == settings.base_currency:
+            continue
+        rate = rnd.uniform(50, 100)
+        for day in range((end - start).days + 1):
+            rate *= rnd.lognormvariate(0, 0.01)
+            yield {
+                'date': start + timedelta(days=day),
+                'currency': currency,
+                'rate': Decimal(f'{rate:.8f}'),
+            }
+
+
+def generate_operations(rnd: random.Random,
+                        user_ids: list[int],
+                        count: int,
+                        start: date,
+                        end: date,
+                        currencies: list[str],
+                        ) -> Iterator[dict]:
+    """Generate operations: few users make most of operations, recent dates are
+    more frequent, amounts are log-normal, most operations are in base currency
+
+    Args:
+        rnd (random.Random): random generator
+        user_ids (list[int]): users to assign operations to
+        count (int): number of operations
+        start (date): first date
+        end (date): last date
+        currencies (list[str]): currencies of operations
+
+    Yields:
+        Iterator[dict]: rows of `operations` table
+    """
+    # heavy tailed activity of users
+    cum_weights = list(accumulate(rnd.paretovariate(1.2) for _ in user_ids))
+    days = (end - start).days + 1
+    others = [currency for currency in currencies if currency != settings.base_currency]
+    for _ in range(count):
+        currency = settings.base_currency
+        if others and rnd.random() >= BASE_CURRENCY_SHARE:
+            currency = rnd.choice(others)
+        is_income = rnd.random() < INCOME_SHARE
+        if is_income:
+            amount_minor = rnd.lognormvariate(math.log(60_000 * MINOR_UNITS), 0.4)
+            descriptions = INCOME_DESCRIPTIONS
+        else:
+            amount_minor = rnd.lognormvariate(math.log(1_500 * MINOR_UNITS), 1.0)
+            descriptions = OUTCOME_DESCRIPTIONS
+        amount_minor = min(max(int(amount_minor), 1), MAX_AMOUNT_MINOR)
+        description = None
+        if rnd.random() >= NO_DESCRIPTION_SHARE:
+            # first descriptions are more frequent
+            description = descriptions[
+                min(int(rnd.expovariate(0.5)), len(descriptions) - 1)]
+        yield {
+            'user_id': rnd.choices(user_ids, cum_weights=cum_weights)[0],
+            # skewed to the end of period: more operations recently
+            'date': start + timedelta(days=int(days * rnd.random() ** 0.7)),
+            'kind': 'income' if is_income else 'outcome',
+            'amount': Decimal(amount_minor) / MINOR_UNITS,
+            'amount_minor': amount_minor,
+            'currency': currency,
+            'description': description,
+        }
+
+
+def insert(connection: Connection,
+           table,
+           rows: Iterator[dict],
+           batch_size: int,
+           transaction_size: int,
+           ) -> int:
+    """Insert rows by executemany of `batch_size` rows, commit every
+    `transaction_size` rows
+
+    Args:
+        connection (Connection): database connection
+        table (Table): table to insert to
+        rows (Iterator[dict]): rows to insert
+        batch_size (int): rows in one executemany
+        transaction_size (int): rows in one transaction
+
+    Returns:
+        int: number of inserted rows
+    """
+    inserted = 0
+    started = time.perf_counter()
+    transaction = connection.begin()
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) < batch_size:
+            continue
+        connection.execute(table.insert(), batch)
+        inserted += len(batch)
+        batch = []
+        if inserted % transaction_size < batch_size:
+            transaction.commit()
+            transaction = connection.begin()
+            rate = inserted / (time.perf_counter() - started)
+            print(f'{table.name}: {inserted} rows, {rate:.0f} rows/s', file=sys.stderr)
+    if batch:
+        connection.execute(table.insert(), batch)
+        inserted += len(batch)
+    transaction.commit()
+    return inserted
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Generate and insert data
+
+    Args:
+        argv (Optional[list[str]], optional): command line arguments.
+        Defaults to None.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', default=settings.database_url)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--operations', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--start', type=date.fromisoformat, default=date(2018, 1, 1))
+    parser.add_argument('--end', type=date.fromisoformat, default=date(2022, 12, 31))
+    parser.add_argument('--currencies', default=settings.base_currency,
+                        help='comma separated currencies of operations, daily rates '
+                             'are generated for all but base one')
+    parser.add_argument('--password', default='password',
+                        help='password of all generated users')
+    parser.add_argument('--batch-size', type=int, default=10_000)
+    parser.add_argument('--transaction-size', type=int, default=1_000_000)
+    parser.add_argument('--create-tables', action='store_true',
+                        help='create missing tables before insert')
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    if engine.dialect.name == 'sqlite':
+        set_sqlite_pragmas(engine)
+    if args.create_tables:
+        tables.Base.metadata.create_all(engine)
+
+    rnd = random.Random(args.seed)
+    currencies = [currency.strip().upper() for currency in args.currencies.split(',')]
+    # bcrypt is slow, so hash once for all users
+    password_hash = AuthService.hash_password(args.password)
+
+    with engine.connect() as connection:
+        first_id = connection.execute(
+            select(func.coalesce(func.max(tables.User.id), 0))).scalar() + 1
+        # rates of previous runs are kept
+        existing_rates = set(connection.execute(
+            select(tables.FxRate.date, tables.FxRate.currency)
+            .where(tables.FxRate.currency.in_(currencies))
+            .where(tables.FxRate.date.between(args.start, args.end))
+        ).all())
+    user_ids = list(range(first_id, first_id + args.users))
+
+    with engine.connect() as connection:
+        # rates first: if they fail, users and operations are not inserted
+        insert(
+            connection,
+            tables.FxRate.__table__,
+            (
+                rate for rate in generate_fx_rates(rnd, currencies, args.start, args.end)
+                if (rate['date'], rate['currency']) not in existing_rates
+            ),
+            args.batch_size,
+            args.transaction_size,
+        )
+        with connection.begin():
+            # running services drop cached rates
+            bump_fx_rates_version(connection)
+        insert(
+            connection,
+            tables.User.__table__,
+            generate_users(rnd, first_id, args.users, password_hash),
+            args.batch_size,
+            args.transaction_size,
+        )
+        insert(
+            connection,
+            tables.Operation.__table__,
+            generate_operations(
+                rnd, user_ids, args.operations, args.start, args.end, currencies),
+            args.batch_size,
+            args.transaction_size,
+        )
+
+
+if __name__ == '__main__':
+    main()
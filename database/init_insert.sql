@@ -1,4 +1,3 @@
-INSERT INTO operations(date, kind, amount, description) VALUES
-    ('2021-02-01', 'income', 1000.00, NULL),
-    ('2021-02-01', 'outcome', 5000.00, 'Ресторан');
-
+INSERT INTO operations(date, kind, amount, amount_minor, description) VALUES
+    ('2021-02-01', 'income', 1000.00, 100000, NULL),
+    ('2021-02-01', 'outcome', 5000.00, 500000, 'Ресторан');
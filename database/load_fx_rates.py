@@ -0,0 +1,88 @@
+"""Load exchange rates from CSV file into `fx_rates` table.
+
+CSV columns: `date,currency,rate`, where rate is price of one unit of currency
+in base currency (settings.base_currency). Rates of the same currency and
+dates are replaced, yearly summaries of archived operations in these currencies
+are recomputed from files in settings.archive_dir. Run from the repository root:
+
+    python -m database.load_fx_rates rates.csv
+"""
+import argparse
+import csv
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import create_engine, tuple_
+
+from src.accounts import tables
+from src.accounts.database import Session
+from src.accounts.services.archive import ArchiveService
+from src.accounts.services.fx import bump_fx_rates_version
+from src.accounts.settings import settings
+
+
+# pairs in one delete, to stay under SQLite limit of variables in one query
+DELETE_CHUNK_SIZE = 400
+
+
+def read_rates(path: str) -> list[dict]:
+    """Read rates from CSV file
+
+    Args:
+        path (str): path to CSV file with header `date,currency,rate`
+
+    Returns:
+        list[dict]: rows of `fx_rates` table
+    """
+    with open(path, encoding='utf-8', newline='') as file:
+        return [
+            {
+                'date': date.fromisoformat(row['date']),
+                'currency': row['currency'].strip().upper(),
+                'rate': Decimal(row['rate']),
+            }
+            for row in csv.DictReader(file)
+        ]
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Replace rates in database by rates from file
+
+    Args:
+        argv (Optional[list[str]], optional): command line arguments.
+        Defaults to None.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path', help='CSV file with `date,currency,rate` header')
+    parser.add_argument('--database-url', default=settings.database_url)
+    parser.add_argument('--archive-dir', default=settings.archive_dir)
+    args = parser.parse_args(argv)
+
+    rows = read_rates(args.path)
+    if not rows:
+        return
+    table = tables.FxRate.__table__
+    keys = [(row['currency'], row['date']) for row in rows]
+
+    settings.archive_dir = args.archive_dir
+    with Session(bind=create_engine(args.database_url)) as session, session.begin():
+        # only exact (currency, date) pairs of the file are replaced
+        for start in range(0, len(keys), DELETE_CHUNK_SIZE):
+            session.execute(table.delete().where(
+                tuple_(table.c.currency, table.c.date)
+                .in_(keys[start:start + DELETE_CHUNK_SIZE])
+            ))
+        session.execute(table.insert(), rows)
+        # running services drop cached rates
+        bump_fx_rates_version(session)
+        # summaries keep sums converted by old rates
+        ArchiveService(session).update_summaries(
+            {row['currency'] for row in rows},
+            min(row['date'] for row in rows),
+        )
+    print(f'{len(rows)} rates loaded')
+
+
+if __name__ == '__main__':
+    main()
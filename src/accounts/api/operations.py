@@ -1,11 +1,15 @@
 # pylint: disable=missing-module-docstring
+from datetime import date
 from typing import Optional
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Query, Response, status
 
 from ..models.operations import (
-    Operation, OperationCreate, OperationKind, OperationUpdate)
+    Balance, Currency, Operation, OperationCreate, OperationKind, OperationProjection,
+    OperationUpdate)
 from .. import tables
+from ..money import from_minor_units
 from ..services.operations import OperationsServices
+from ..settings import settings
 
 
 router = APIRouter(
@@ -13,22 +17,81 @@ router = APIRouter(
 )
 
 
-@router.get('/', response_model=list[Operation])
+def parse_fields(fields: Optional[str] = Query(
+        None,
+        description='Comma separated fields to return, e.g. `id,date,amount`',
+        )) -> Optional[list[str]]:
+    """Split `fields=` query parameter into list of fields
+
+    Args:
+        fields (Optional[str], optional): comma separated fields. Defaults to None.
+
+    Returns:
+        Optional[list[str]]: requested fields or None if all fields are needed
+    """
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(',') if field.strip()]
+
+
+@router.get('/',
+            response_model=list[OperationProjection],
+            response_model_exclude_unset=True)
 def get_operations(kind: Optional[OperationKind] = None,
+                   fields: Optional[list[str]] = Depends(parse_fields),
+                   date_from: Optional[date] = None,
+                   date_to: Optional[date] = None,
                    service: OperationsServices = Depends(),
-                   ) -> list[tables.Operation]:
-    """Get all operations from the db
+                   ) -> list[dict]:
+    """Get all operations from the db, archived ones are included if they are in
+    dates range
 
     Args:
         kind (Optional[Operationkind], optional): filter by operation kind, if None -
         all opearions. Defaults to None.
+        fields (Optional[list[str]], optional): fields to select and return, if None -
+        all fields. Defaults to Depends(parse_fields).
+        date_from (Optional[date], optional): first date. Defaults to None.
+        date_to (Optional[date], optional): last date. Defaults to None.
+        service (OperationsServices, optional): run database session using __init__.
+        Defaults to Depends().
+
+    Returns:
+        list[dict]: all operations (filtered by `kind` or not) with requested fields
+    """
+    operations = service.get_list(
+        kind=kind, fields=fields, date_from=date_from, date_to=date_to)
+    if settings.money_minor_units and (not fields or 'amount' in fields):
+        for operation in operations:
+            if operation['amount'] is not None:
+                operation['amount'] = from_minor_units(operation['amount'])
+    return operations
+
+
+@router.get('/balance', response_model=Balance)
+def get_balance(currency: Optional[Currency] = None,
+                date_from: Optional[date] = None,
+                date_to: Optional[date] = None,
+                service: OperationsServices = Depends(),
+                ) -> Balance:
+    """Get sums of incomes and outcomes and their difference
+
+    Args:
+        currency (Optional[Currency], optional): currency to convert sums to, base
+        currency if None. Defaults to None.
+        date_from (Optional[date], optional): first date. Defaults to None.
+        date_to (Optional[date], optional): last date. Defaults to None.
         service (OperationsServices, optional): run database session using __init__.
         Defaults to Depends().
 
     Returns:
-        list[tables.Operation]: all operations (filtered by `kind` or not)
+        Balance: sums of operations
     """
-    return service.get_list(kind=kind)
+    sums = service.get_balance(
+        currency=currency, date_from=date_from, date_to=date_to)
+    if settings.money_minor_units:
+        sums = {key: from_minor_units(value) for key, value in sums.items()}
+    return Balance(currency=currency or settings.base_currency, **sums)
 
 
 @router.post('/', response_model=Operation)
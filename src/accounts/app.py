@@ -1,7 +1,23 @@
 # pylint: disable=missing-module-docstring
+from brotli_asgi import BrotliMiddleware
 from fastapi import FastAPI
+
 from .api import router
+from .database import dispose_engine
+from .settings import settings
 
 
 app = FastAPI()
+# brotli if client accepts it, otherwise gzip
+app.add_middleware(
+    BrotliMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_fallback=True,
+)
 app.include_router(router)
+
+
+@app.on_event('shutdown')
+def shutdown() -> None:
+    """Release database connections, engine itself is created on first request"""
+    dispose_engine()
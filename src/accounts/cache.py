@@ -0,0 +1,61 @@
+# pylint: disable=missing-module-docstring
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """In-memory LRU cache with time to live, safe to share between threads"""
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get value by key
+
+        Args:
+            key (Hashable): key of value
+
+        Returns:
+            Optional[Any]: value or None if there is no key or it is expired
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Set value, the least recently used one is dropped if cache is full
+
+        Args:
+            key (Hashable): key of value
+            value (Any): value to store
+        """
+        with self._lock:
+            self._data[key] = (monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove value by key if it exists
+
+        Args:
+            key (Hashable): key of value
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all values"""
+        with self._lock:
+            self._data.clear()
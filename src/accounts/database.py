@@ -1,19 +1,42 @@
 # pylint: disable=missing-module-docstring
+from functools import lru_cache
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
 from .settings import settings
 
 
-# For a first run: Base.metadata.create_all(engine)
-engine = create_engine(
-    settings.database_url,
-    # To have one query - one session
-    connect_args={'check_same_thread': False},
-)
+@lru_cache(maxsize=None)
+def get_engine() -> Engine:
+    """Create engine on first use, not at import (faster cold start)
+
+    Returns:
+        Engine: engine for `settings.database_url`
+    """
+    # For a first run: Base.metadata.create_all(get_engine())
+    return create_engine(
+        settings.database_url,
+        # To have one query - one session
+        connect_args={'check_same_thread': False},
+    )
+
+
+def dispose_engine() -> None:
+    """Close engine connections if engine was created"""
+    if get_engine.cache_info().currsize:
+        get_engine().dispose()
+
+
+def __getattr__(name: str):
+    """Keep `from .database import engine` working, engine is created lazily"""
+    if name == 'engine':
+        return get_engine()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 
 Session = sessionmaker(
-    engine,
     autocommit=False,  # better to make manually
     autoflush=False,
 )
@@ -21,7 +44,7 @@ Session = sessionmaker(
 
 def get_session():
     """Session handler"""
-    session = Session()
+    session = Session(bind=get_engine())
     try:
         yield session
     except:
@@ -3,7 +3,11 @@ from datetime import date
 from decimal import Decimal
 from enum import Enum
 from typing import Optional
-from pydantic import BaseModel  # pylint: disable=no-name-in-module
+from pydantic import BaseModel, condecimal, constr  # pylint: disable=no-name-in-module
+
+
+# ISO 4217 code, e.g. `USD`
+Currency = constr(regex=r'^[A-Z]{3}$')
 
 
 class OperationKind(str, Enum):
@@ -16,8 +20,11 @@ class OperationBase(BaseModel):
     """Base class for operation table manipulations"""
     date: date
     kind: OperationKind
-    amount: Decimal
+    # as `Numeric(10, 2)`: no rounding, so `amount` and `amount_minor` are equal
+    amount: condecimal(max_digits=10, decimal_places=2)
     description: Optional[str]
+    # `settings.base_currency` if not set
+    currency: Optional[Currency]
 
 
 class Operation(OperationBase):
@@ -29,9 +36,27 @@ class Operation(OperationBase):
         orm_mode = True
 
 
+class OperationProjection(BaseModel):
+    """Schema of operation with only requested fields (see `fields=` parameter)"""
+    id: Optional[int]
+    date: Optional[date]
+    kind: Optional[OperationKind]
+    amount: Optional[Decimal]
+    description: Optional[str]
+    currency: Optional[str]
+
+
 class OperationCreate(OperationBase):
     """Schema to create a new operation"""
 
 
 class OperationUpdate(OperationBase):
     """Schema to update operation"""
+
+
+class Balance(BaseModel):
+    """Schema of operations sums converted to one currency"""
+    currency: str
+    income: Decimal
+    outcome: Decimal
+    total: Decimal
@@ -0,0 +1,31 @@
+# pylint: disable=missing-module-docstring
+from decimal import ROUND_HALF_UP, Decimal
+
+
+# minor units (cents) in one major unit, matches scale of `Numeric(10, 2)`
+MINOR_UNITS = 100
+_CENT = Decimal(1) / MINOR_UNITS
+
+
+def to_minor_units(amount: Decimal) -> int:
+    """Convert amount to integer minor units (cents)
+
+    Args:
+        amount (Decimal): amount in major units
+
+    Returns:
+        int: amount in minor units, rounded half up
+    """
+    return int((Decimal(amount) * MINOR_UNITS).quantize(Decimal(1), ROUND_HALF_UP))
+
+
+def from_minor_units(amount: int) -> Decimal:
+    """Convert integer minor units (cents) to amount
+
+    Args:
+        amount (int): amount in minor units
+
+    Returns:
+        Decimal: amount in major units
+    """
+    return (Decimal(amount) / MINOR_UNITS).quantize(_CENT)
@@ -0,0 +1,361 @@
+# pylint: disable=missing-module-docstring
+import io
+import json
+import os
+from collections import defaultdict
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from fastapi import Depends
+from sqlalchemy import extract, func
+from sqlalchemy.orm import Session
+
+from .. import tables
+from ..database import get_session
+from ..money import to_minor_units
+from ..settings import settings
+from .fx import fx_rates_cache
+
+
+ZSTD_LEVEL = 10
+# ids in one delete, to stay under SQLite limit of variables in one query
+DELETE_CHUNK_SIZE = 500
+
+# zstandard is imported on first use: most requests do not read archive
+# pylint: disable=import-outside-toplevel
+
+
+def write_segment(path: Path, records: Iterable[dict]) -> None:
+    """Write records to new zstd compressed NDJSON file, read only after writing
+
+    Args:
+        path (Path): file to create
+        records (Iterable[dict]): records to write
+
+    Raises:
+        FileExistsError: if file exists, archived files are never overwritten
+    """
+    import zstandard
+    if path.exists():
+        raise FileExistsError(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    # segment is one user and year: small enough to compress at once, which is
+    # much faster than a stream per file
+    data = ''.join(
+        json.dumps(record, ensure_ascii=False) + '\n' for record in records).encode()
+    with open(tmp_path, 'wb') as file:
+        file.write(zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data))
+        file.flush()
+        os.fsync(file.fileno())
+    os.chmod(tmp_path, 0o444)
+    # file appears only when it is complete
+    os.replace(tmp_path, path)
+
+
+def read_segment(path: Path) -> Iterator[dict]:
+    """Read records from zstd compressed NDJSON file
+
+    Args:
+        path (Path): file to read
+
+    Yields:
+        Iterator[dict]: archived records
+    """
+    import zstandard
+    decompressor = zstandard.ZstdDecompressor()
+    with open(path, 'rb') as file, decompressor.stream_reader(file) as reader:
+        for line in io.TextIOWrapper(reader, encoding='utf-8'):
+            yield json.loads(line)
+
+
+def to_record(operation: tables.Operation) -> dict:
+    """Convert operation to JSON serializable record
+
+    Args:
+        operation (tables.Operation): operation
+
+    Returns:
+        dict: record to archive
+    """
+    amount_minor = operation.amount_minor
+    if amount_minor is None and operation.amount is not None:
+        amount_minor = to_minor_units(operation.amount)
+    return {
+        'id': operation.id,
+        'user_id': operation.user_id,
+        'date': operation.date.isoformat(),
+        'kind': operation.kind,
+        'amount': None if operation.amount is None else str(operation.amount),
+        'amount_minor': amount_minor,
+        'currency': operation.currency or settings.base_currency,
+        'description': operation.description,
+    }
+
+
+class ArchiveService:
+    """Class to move old operations to compressed files and read them back"""
+    def __init__(self, session: Session = Depends(get_session)):
+        self.session = session
+
+    def archive(self, before: date) -> int:
+        """Move operations older than `before` to files, one new file per user and
+        year, and add their sums to yearly summaries
+
+        Args:
+            before (date): operations before this date are archived
+
+        Returns:
+            int: number of archived operations
+        """
+        partitions = (
+            self.session
+            .query(tables.Operation.user_id, extract('year', tables.Operation.date))
+            .filter(tables.Operation.date < before)
+            .distinct()
+            .all()
+        )
+        return sum(
+            self._archive_partition(user_id, int(year), before)
+            for user_id, year in partitions
+        )
+
+    def _archive_partition(self, user_id: Optional[int], year: int, before: date) -> int:
+        """Archive operations of user for year in one transaction
+
+        Args:
+            user_id (Optional[int]): user id
+            year (int): year of operations
+            before (date): operations before this date are archived
+
+        Returns:
+            int: number of archived operations
+        """
+        # `==` becomes `IS NULL` for operations without user, both use
+        # `ix_operations_user_id_date`
+        operations = (
+            self.session
+            .query(tables.Operation)
+            .filter(tables.Operation.user_id == user_id)
+            .filter(tables.Operation.date >= date(year, 1, 1))
+            .filter(tables.Operation.date < min(date(year + 1, 1, 1), before))
+            .order_by(tables.Operation.date, tables.Operation.id)
+            .all()
+        )
+        if not operations:
+            return 0
+        records = [to_record(operation) for operation in operations]
+
+        segment = tables.ArchiveSegment(
+            user_id=user_id,
+            year=year,
+            path='',
+            min_date=operations[0].date,
+            max_date=operations[-1].date,
+            rows=len(records),
+        )
+        self.session.add(segment)
+        self.session.flush()
+        # id makes name unique: later archive runs add new files
+        segment.path = f'user_{user_id}/{year}/{segment.id}.ndjson.zst'
+        path = Path(settings.archive_dir) / segment.path
+
+        written = False
+        try:
+            self._add_summaries(user_id, year, records)
+            write_segment(path, records)
+            written = True
+            # by ids: operations added after select are not written to file
+            ids = [operation.id for operation in operations]
+            for start in range(0, len(ids), DELETE_CHUNK_SIZE):
+                (
+                    self.session
+                    .query(tables.Operation)
+                    .filter(tables.Operation.id.in_(ids[start:start + DELETE_CHUNK_SIZE]))
+                    .delete(synchronize_session=False)
+                )
+            self.session.commit()
+        except BaseException:
+            self.session.rollback()
+            if written:
+                path.unlink()
+            raise
+        return len(records)
+
+    def _sum_records(self, records: list[dict]) -> dict[tuple[str, str], list]:
+        """Sum records by kind and currency
+
+        Args:
+            records (list[dict]): archived records, `date` as string
+
+        Returns:
+            dict[tuple[str, str], list]: (kind, currency) -> [count, amount,
+            amount in base currency], amounts in minor units
+        """
+        dates = [record['date'] for record in records]
+        fx_rates_cache.preload(
+            self.session,
+            {record['currency'] for record in records},
+            date.fromisoformat(min(dates)),
+            date.fromisoformat(max(dates)),
+        )
+        totals: dict[tuple[str, str], list] = defaultdict(lambda: [0, 0, Decimal(0)])
+        for record in records:
+            if record['amount_minor'] is None:
+                continue
+            total = totals[(record['kind'], record['currency'])]
+            total[0] += 1
+            total[1] += record['amount_minor']
+            total[2] += record['amount_minor'] * fx_rates_cache.rate(
+                record['currency'], date.fromisoformat(record['date']))
+        for total in totals.values():
+            total[2] = int(total[2].quantize(Decimal(1), ROUND_HALF_UP))
+        return totals
+
+    def _add_summaries(self, user_id: Optional[int], year: int, records: list[dict]) -> None:
+        """Add sums of records to yearly summaries
+
+        Args:
+            user_id (Optional[int]): user id
+            year (int): year of records
+            records (list[dict]): archived records
+        """
+        totals = self._sum_records(records)
+        for (kind, currency), (count, amount, amount_base) in totals.items():
+            summary = (
+                self.session
+                .query(tables.OperationSummary)
+                .filter_by(user_id=user_id, year=year, kind=kind, currency=currency)
+                .first()
+            )
+            if summary is None:
+                summary = tables.OperationSummary(
+                    user_id=user_id, year=year, kind=kind, currency=currency,
+                    count=0, amount_minor=0, amount_base_minor=0,
+                )
+                self.session.add(summary)
+            summary.count += count
+            summary.amount_minor += amount
+            summary.amount_base_minor += amount_base
+
+    def update_summaries(self, currencies: Iterable[str], date_from: date) -> int:
+        """Recompute sums in base currency of yearly summaries from archive files
+        after rates of `currencies` are changed from `date_from`, call it in the
+        transaction which changes rates
+
+        Args:
+            currencies (Iterable[str]): currencies with changed rates
+            date_from (date): first date with changed rate
+
+        Returns:
+            int: number of updated summaries
+        """
+        # rate is used until the next one, so all later years are affected
+        partitions = (
+            self.session
+            .query(tables.OperationSummary.user_id, tables.OperationSummary.year)
+            .filter(tables.OperationSummary.currency.in_(list(currencies)))
+            .filter(tables.OperationSummary.year >= date_from.year)
+            .distinct()
+            .all()
+        )
+        updated = 0
+        for user_id, year in partitions:
+            segments = (
+                self.session
+                .query(tables.ArchiveSegment)
+                .filter(tables.ArchiveSegment.user_id == user_id)
+                .filter(tables.ArchiveSegment.year == year)
+                .all()
+            )
+            records = [
+                record
+                for segment in segments
+                for record in read_segment(Path(settings.archive_dir) / segment.path)
+            ]
+            totals = self._sum_records(records)
+            summaries = (
+                self.session
+                .query(tables.OperationSummary)
+                .filter(tables.OperationSummary.user_id == user_id)
+                .filter(tables.OperationSummary.year == year)
+                .all()
+            )
+            for summary in summaries:
+                summary.amount_base_minor = totals[(summary.kind, summary.currency)][2]
+                updated += 1
+        self.session.flush()
+        return updated
+
+    def get_segments(self,
+                     date_from: Optional[date] = None,
+                     date_to: Optional[date] = None,
+                     ) -> list[tables.ArchiveSegment]:
+        """Get segments with operations in dates range
+
+        Args:
+            date_from (Optional[date], optional): first date. Defaults to None.
+            date_to (Optional[date], optional): last date. Defaults to None.
+
+        Returns:
+            list[tables.ArchiveSegment]: segments overlapping the range
+        """
+        query = self.session.query(tables.ArchiveSegment)
+        if date_from:
+            query = query.filter(tables.ArchiveSegment.max_date >= date_from)
+        if date_to:
+            query = query.filter(tables.ArchiveSegment.min_date <= date_to)
+        return query.order_by(tables.ArchiveSegment.min_date, tables.ArchiveSegment.id).all()
+
+    @staticmethod
+    def read(segments: Iterable[tables.ArchiveSegment],
+             date_from: Optional[date] = None,
+             date_to: Optional[date] = None,
+             kind: Optional[str] = None,
+             ) -> Iterator[dict]:
+        """Read archived operations from segments
+
+        Args:
+            segments (Iterable[tables.ArchiveSegment]): segments to read
+            date_from (Optional[date], optional): first date. Defaults to None.
+            date_to (Optional[date], optional): last date. Defaults to None.
+            kind (Optional[str], optional): kind of operations. Defaults to None.
+
+        Yields:
+            Iterator[dict]: archived records, `date` as date
+        """
+        for segment in segments:
+            for record in read_segment(Path(settings.archive_dir) / segment.path):
+                record['date'] = date.fromisoformat(record['date'])
+                if date_from and record['date'] < date_from:
+                    continue
+                if date_to and record['date'] > date_to:
+                    continue
+                if kind and record['kind'] != kind:
+                    continue
+                yield record
+
+    def get_summaries(self, years: Iterable[int]) -> list[tuple[str, int]]:
+        """Sum yearly summaries of all users by kind
+
+        Args:
+            years (Iterable[int]): years to sum
+
+        Returns:
+            list[tuple[str, int]]: kind and sum in base currency minor units
+        """
+        years = list(years)
+        if not years:
+            return []
+        return (
+            self.session
+            .query(
+                tables.OperationSummary.kind,
+                func.sum(tables.OperationSummary.amount_base_minor),
+            )
+            .filter(tables.OperationSummary.year.in_(years))
+            .group_by(tables.OperationSummary.kind)
+            .all()
+        )
@@ -3,8 +3,6 @@ from datetime import datetime, timedelta
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from passlib.hash import bcrypt
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
@@ -12,8 +10,12 @@ from ..tables import User as TablesUser
 from ..models.auth import User as ModelsUser, Token, UserCreate
 from ..settings import settings
 from ..database import get_session
+from .users import users_cache
 
 
+# jose and passlib (bcrypt) are imported on first use to speed up cold start
+# pylint: disable=import-outside-toplevel
+
 # '/auth/sign-in/' - redirect url if no token provided
 oauth_scheme = OAuth2PasswordBearer(tokenUrl='/auth/sign-in')
 
@@ -44,6 +46,7 @@ class AuthService:
         Returns:
             bool: verify or not
         """
+        from passlib.hash import bcrypt
         return bcrypt.verify(plain_pwd, hashed_pwd)
 
     @classmethod
@@ -56,6 +59,7 @@ class AuthService:
         Returns:
             str: hashed password
         """
+        from passlib.hash import bcrypt
         return bcrypt.hash(pwd)
 
     @classmethod
@@ -71,6 +75,7 @@ class AuthService:
         Returns:
             models.auth.User: user data
         """
+        from jose import JWTError, jwt
         exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Could not validate credentials',
@@ -106,6 +111,7 @@ class AuthService:
         Returns:
             Token: generated token
         """
+        from jose import jwt
         user_data = ModelsUser.from_orm(user)
 
         now = datetime.utcnow()
@@ -147,6 +153,7 @@ class AuthService:
 
         self.session.add(user)
         self.session.commit()
+        users_cache.invalidate(user.id, user.username)
 
         return self.create_token(user)
 
@@ -170,6 +177,8 @@ class AuthService:
                 'WWW-Authenticate': 'Bearer'
             },
         )
+        # always from database: password may be changed by another process, and
+        # bcrypt costs much more than lookup by unique username
         user = (
             self.session
             .query(TablesUser)
@@ -183,4 +192,5 @@ class AuthService:
         if not self.verify_password(password, user.password_hash):
             raise exception
 
+        users_cache.set(ModelsUser.from_orm(user))
         return self.create_token(user)
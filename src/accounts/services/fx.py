@@ -0,0 +1,146 @@
+# pylint: disable=missing-module-docstring
+from bisect import bisect_right
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, NamedTuple, Optional, Union
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from .. import tables
+from ..cache import TTLCache
+from ..settings import settings
+
+
+def get_fx_rates_version(connection: Union[Session, Connection]) -> int:
+    """Get version of `fx_rates`, it is changed on every change of rates
+
+    Args:
+        connection (Union[Session, Connection]): database session or connection
+
+    Returns:
+        int: version, 0 if rates were never loaded
+    """
+    table = tables.FxRatesVersion.__table__
+    return connection.execute(select(table.c.version)).scalar() or 0
+
+
+def bump_fx_rates_version(connection: Union[Session, Connection]) -> None:
+    """Change version of `fx_rates`, call it in the transaction which changes rates
+
+    Args:
+        connection (Union[Session, Connection]): database session or connection
+    """
+    table = tables.FxRatesVersion.__table__
+    updated = connection.execute(table.update().values(version=table.c.version + 1))
+    if not updated.rowcount:
+        connection.execute(table.insert().values(id=1, version=1))
+
+
+class RatesSeries(NamedTuple):
+    """Rates of one currency loaded for dates range"""
+    start: date
+    end: date
+    dates: list[date]
+    rates: list[Decimal]
+
+
+class FxRatesCache:
+    """In-memory cache of `fx_rates`: rates are preloaded by dates range for all
+    needed currencies at once, lookups do not touch the database. Cache is dropped
+    if `fx_rates_version` is changed, it is checked by one query on every preload,
+    so rates loaded by another process are picked up by the next request"""
+    def __init__(self, ttl: float, maxsize: int = 256):
+        self._series = TTLCache(ttl, maxsize)
+        self._version: Optional[int] = None
+
+    def preload(self,
+                session: Session,
+                currencies: Iterable[str],
+                start: date,
+                end: date,
+                ) -> None:
+        """Load rates for [`start`, `end`] and the last rate before `start` for
+        currencies which are not cached for this range yet, drop all rates if they
+        are changed in database
+
+        Args:
+            session (Session): database session
+            currencies (Iterable[str]): currencies to load
+            start (date): first date
+            end (date): last date
+        """
+        version = get_fx_rates_version(session)
+        if version != self._version:
+            self._series.clear()
+            self._version = version
+
+        missed = set()
+        for currency in set(currencies) - {settings.base_currency}:
+            series = self._series.get(currency)
+            if series is None or series.start > start or series.end < end:
+                missed.add(currency)
+        if not missed:
+            return
+
+        # the last rate before `start` is the actual one on `start`
+        lower = (
+            session
+            .query(func.max(tables.FxRate.date))
+            .filter(tables.FxRate.date <= start)
+            .filter(tables.FxRate.currency.in_(missed))
+            .group_by(tables.FxRate.currency)
+            .all()
+        )
+        lower_bound = min((row[0] for row in lower), default=start)
+        rows = (
+            session
+            .query(tables.FxRate.currency, tables.FxRate.date, tables.FxRate.rate)
+            .filter(tables.FxRate.currency.in_(missed))
+            .filter(tables.FxRate.date.between(lower_bound, end))
+            .order_by(tables.FxRate.currency, tables.FxRate.date)
+            .all()
+        )
+        loaded: dict[str, RatesSeries] = {
+            currency: RatesSeries(start, end, [], []) for currency in missed}
+        for currency, rate_date, rate in rows:
+            loaded[currency].dates.append(rate_date)
+            loaded[currency].rates.append(Decimal(rate))
+        for currency, series in loaded.items():
+            self._series.set(currency, series)
+
+    def rate(self, currency: str, on_date: date) -> Decimal:
+        """Actual rate of currency on date, must be preloaded
+
+        Args:
+            currency (str): currency
+            on_date (date): date
+
+        Raises:
+            HTTPException: if there is no rate on date or before it
+
+        Returns:
+            Decimal: price of one unit of currency in `settings.base_currency`
+        """
+        if currency == settings.base_currency:
+            return Decimal(1)
+        series: Optional[RatesSeries] = self._series.get(currency)
+        index = 0
+        if series is not None and series.start <= on_date <= series.end:
+            index = bisect_right(series.dates, on_date)
+        if not index:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f'No exchange rate for {currency} on {on_date}',
+            )
+        return series.rates[index - 1]
+
+    def clear(self) -> None:
+        """Drop all rates"""
+        self._series.clear()
+
+
+# shared between requests
+fx_rates_cache = FxRatesCache(settings.fx_cache_ttl)
@@ -1,12 +1,21 @@
 # pylint: disable=missing-module-docstring
-from typing import Optional
+from collections import defaultdict
+from datetime import date
+from typing import Optional, Union
+from decimal import ROUND_HALF_UP, Decimal
 from fastapi import Depends, HTTPException, status
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from ..models.operations import OperationCreate, OperationKind, OperationUpdate
+from ..models.operations import (
+    Operation, OperationCreate, OperationKind, OperationUpdate)
 
 from .. import tables
 from ..database import get_session
+from ..money import MINOR_UNITS, from_minor_units, to_minor_units
+from ..settings import settings
+from .archive import ArchiveService
+from .fx import fx_rates_cache
 
 
 class OperationsServices:
@@ -37,19 +46,235 @@ class OperationsServices:
                 status_code=status.HTTP_404_NOT_FOUND)
         return operation
 
-    def get_list(self, kind: Optional[OperationKind] = None) -> list[tables.Operation]:
-        """Return all operations
+    @staticmethod
+    def _amount_column():
+        """`amount` column to read: decimal or minor units one
 
         Returns:
+            Column: `amount_minor` if `settings.money_minor_units` else `amount`
+        """
+        if settings.money_minor_units:
+            return tables.Operation.amount_minor
+        return tables.Operation.amount
+
+    @classmethod
+    def _get_columns(cls, fields: Optional[list[str]] = None) -> list:
+        """Map requested fields to `operations` table columns, `amount` is read in
+        minor units if `settings.money_minor_units`
+
+        Args:
+            fields (Optional[list[str]], optional): fields of `models.Operation` to
+            select, all fields if None. Defaults to None.
+
+        Raises:
+            HTTPException: if there is unknown field
+
+        Returns:
+            list: columns of `tables.Operation` to be selected
+        """
+        if not fields:
+            fields = list(Operation.__fields__)
+        unknown = [field for field in fields if field not in Operation.__fields__]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f'Unknown fields: {", ".join(unknown)}',
+            )
+        # dict.fromkeys to drop duplicates and keep order
+        return [
+            cls._amount_column().label(field) if field == 'amount'
+            else getattr(tables.Operation, field)
+            for field in dict.fromkeys(fields)
+        ]
+
+    @staticmethod
+    def _filter_dates(query, date_from: Optional[date], date_to: Optional[date]):
+        """Filter query by operation date
+
+        Args:
+            query (Query): query of `operations` table
+            date_from (Optional[date]): first date, not filtered if None
+            date_to (Optional[date]): last date, not filtered if None
+
+        Returns:
+            Query: filtered query
+        """
+        if date_from:
+            query = query.filter(tables.Operation.date >= date_from)
+        if date_to:
+            query = query.filter(tables.Operation.date <= date_to)
+        return query
+
+    @staticmethod
+    def _archived_amount(amount_minor: Optional[int]) -> Union[Decimal, int, None]:
+        """Convert archived amount to units of `settings.money_minor_units` mode
+
+        Args:
+            amount_minor (Optional[int]): amount in minor units
+
+        Returns:
+            Union[Decimal, int, None]: amount as it is read from database
+        """
+        if amount_minor is None or settings.money_minor_units:
+            return amount_minor
+        return from_minor_units(amount_minor)
+
+    def get_list(self,
+                 kind: Optional[OperationKind] = None,
+                 fields: Optional[list[str]] = None,
+                 date_from: Optional[date] = None,
+                 date_to: Optional[date] = None,
+                 ) -> list[dict]:
+        """Return all operations, archived ones are read from archive files only if
+        they are in dates range
+
+        Args:
             kind (Optional[Operationkind], optional): filter by operation kind or not.
             Defaults to None.
-            list[tables.Operation]: operations
+            fields (Optional[list[str]], optional): columns to select, all if None.
+            Defaults to None.
+            date_from (Optional[date], optional): first date. Defaults to None.
+            date_to (Optional[date], optional): last date. Defaults to None.
+
+        Returns:
+            list[dict]: operations with requested fields only, `amount` in minor units
+            if `settings.money_minor_units`
         """
-        query = self.session.query(tables.Operation)
+        columns = self._get_columns(fields)
+        query = self._filter_dates(self.session.query(*columns), date_from, date_to)
         if kind:
-            query = query.filter_by(kind=kind)
-        operations = query.all()
-        return operations
+            query = query.filter(tables.Operation.kind == kind)
+        operations = [row._asdict() for row in query.all()]
+
+        archive = ArchiveService(self.session)
+        segments = archive.get_segments(date_from, date_to)
+        if not segments:
+            return operations
+        names = [column.key for column in columns]
+        archived = []
+        for record in archive.read(segments, date_from, date_to, kind):
+            record['amount'] = self._archived_amount(record['amount_minor'])
+            archived.append({name: record.get(name) for name in names})
+        return archived + operations
+
+    @staticmethod
+    def _round_amount(amount: Union[Decimal, int]) -> Union[Decimal, int]:
+        """Round converted amount to minor units
+
+        Args:
+            amount (Union[Decimal, int]): amount
+
+        Returns:
+            Union[Decimal, int]: int if `settings.money_minor_units` else Decimal
+            with 2 digits after point
+        """
+        if settings.money_minor_units:
+            return int(Decimal(amount).quantize(Decimal(1), ROUND_HALF_UP))
+        return Decimal(amount).quantize(Decimal(1) / MINOR_UNITS, ROUND_HALF_UP)
+
+    def _get_archived_groups(self,
+                             sums: dict[str, Union[Decimal, int]],
+                             currency: str,
+                             date_from: Optional[date],
+                             date_to: Optional[date],
+                             ) -> list[tuple]:
+        """Add yearly summaries of archived years fully in dates range to `sums`,
+        other archived operations in range are read from files
+
+        Args:
+            sums (dict[str, Union[Decimal, int]]): sums by kind to add summaries to
+            currency (str): currency of sums
+            date_from (Optional[date]): first date
+            date_to (Optional[date]): last date
+
+        Returns:
+            list[tuple]: sums of archived operations not in summaries as
+            (date, currency, kind, amount)
+        """
+        archive = ArchiveService(self.session)
+        segments = archive.get_segments(date_from, date_to)
+        summarized = set()
+        # summaries are in base currency only
+        if currency == settings.base_currency:
+            summarized = {
+                segment.year for segment in segments
+                if (not date_from or date_from <= date(segment.year, 1, 1))
+                and (not date_to or date_to >= date(segment.year, 12, 31))
+            }
+        for kind, amount in archive.get_summaries(summarized):
+            sums[kind] = sums.get(kind, 0) + self._archived_amount(amount)
+
+        groups: dict[tuple, Union[Decimal, int]] = defaultdict(int)
+        segments = [segment for segment in segments if segment.year not in summarized]
+        for record in archive.read(segments, date_from, date_to):
+            if record['amount_minor'] is not None:
+                key = (record['date'], record['currency'], record['kind'])
+                groups[key] += record['amount_minor']
+        return [
+            (*key, self._archived_amount(amount)) for key, amount in groups.items()]
+
+    def get_balance(self,
+                    currency: Optional[str] = None,
+                    date_from: Optional[date] = None,
+                    date_to: Optional[date] = None,
+                    ) -> dict[str, Union[Decimal, int]]:
+        """Sum operations by kind converted to one currency. Operations are summed by
+        date and currency in database, so conversion is one per (date, currency),
+        not per operation. Archived operations are taken from yearly summaries if
+        possible
+
+        Args:
+            currency (Optional[str], optional): currency of result,
+            `settings.base_currency` if None. Defaults to None.
+            date_from (Optional[date], optional): first date. Defaults to None.
+            date_to (Optional[date], optional): last date. Defaults to None.
+
+        Returns:
+            dict[str, Union[Decimal, int]]: `income`, `outcome` and `total`, in minor
+            units if `settings.money_minor_units`
+        """
+        currency = currency or settings.base_currency
+        query = (
+            self.session
+            .query(
+                tables.Operation.date,
+                tables.Operation.currency,
+                tables.Operation.kind,
+                func.sum(self._amount_column()),
+            )
+            .group_by(
+                tables.Operation.date,
+                tables.Operation.currency,
+                tables.Operation.kind,
+            )
+        )
+        groups = self._filter_dates(query, date_from, date_to).all()
+        sums = {OperationKind.INCOME.value: 0, OperationKind.OUTCOME.value: 0}
+        groups += self._get_archived_groups(sums, currency, date_from, date_to)
+
+        dates = [group[0] for group in groups if group[0] is not None]
+        if dates:
+            fx_rates_cache.preload(
+                self.session,
+                {group[1] or settings.base_currency for group in groups} | {currency},
+                min(dates),
+                max(dates),
+            )
+        for operation_date, operation_currency, kind, amount in groups:
+            if amount is None:
+                continue
+            operation_currency = operation_currency or settings.base_currency
+            if operation_currency != currency:
+                amount = (
+                    amount
+                    * fx_rates_cache.rate(operation_currency, operation_date)
+                    / fx_rates_cache.rate(currency, operation_date)
+                )
+            sums[kind] = sums.get(kind, 0) + amount
+
+        income = self._round_amount(sums[OperationKind.INCOME.value])
+        outcome = self._round_amount(sums[OperationKind.OUTCOME.value])
+        return {'income': income, 'outcome': outcome, 'total': income - outcome}
 
     def get(self, operation_id: int) -> tables.Operation:
         """Get specific operation by id
@@ -75,7 +300,14 @@ class OperationsServices:
         Returns:
             tables.Operation: return operation_data with id
         """
-        operation = tables.Operation(**operation_data.dict(),)
+        amount_minor = to_minor_units(operation_data.amount)
+        operation = tables.Operation(
+            **operation_data.dict(exclude={'currency', 'amount'}),
+            currency=operation_data.currency or settings.base_currency,
+            # both amount columns from the same value
+            amount=from_minor_units(amount_minor),
+            amount_minor=amount_minor,
+        )
         self.session.add(operation)
         self.session.commit()
         return operation
@@ -96,6 +328,10 @@ class OperationsServices:
         operation = self._get(operation_id)
         for field, value in operation_data:
             setattr(operation, field, value)
+        operation.currency = operation_data.currency or settings.base_currency
+        # both amount columns from the same value
+        operation.amount_minor = to_minor_units(operation_data.amount)
+        operation.amount = from_minor_units(operation.amount_minor)
         self.session.commit()
         return operation
 
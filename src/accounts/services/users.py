@@ -0,0 +1,142 @@
+# pylint: disable=missing-module-docstring
+from typing import Iterable, Optional
+
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from ..cache import TTLCache
+from ..database import get_session
+from ..models.auth import User as ModelsUser
+from ..settings import settings
+from ..tables import User as TablesUser
+
+
+class UsersCache:
+    """Users cache keyed both by id and by username. Password hashes are not
+    cached: sign-in always checks password against database"""
+    def __init__(self, ttl: float, maxsize: int):
+        self._by_id = TTLCache(ttl, maxsize)
+        self._by_username = TTLCache(ttl, maxsize)
+
+    def get_by_id(self, user_id: int) -> Optional[ModelsUser]:
+        """Get cached user by id
+
+        Args:
+            user_id (int): user id
+
+        Returns:
+            Optional[ModelsUser]: user or None if it is not cached
+        """
+        if not settings.user_cache_enabled:
+            return None
+        return self._by_id.get(user_id)
+
+    def get_by_username(self, username: str) -> Optional[ModelsUser]:
+        """Get cached user by username
+
+        Args:
+            username (str): username
+
+        Returns:
+            Optional[ModelsUser]: user or None if it is not cached
+        """
+        if not settings.user_cache_enabled:
+            return None
+        return self._by_username.get(username)
+
+    def set(self, user: ModelsUser) -> None:
+        """Put user to cache
+
+        Args:
+            user (ModelsUser): user to cache
+        """
+        if not settings.user_cache_enabled:
+            return
+        self._by_id.set(user.id, user)
+        self._by_username.set(user.username, user)
+
+    def invalidate(self,
+                   user_id: Optional[int] = None,
+                   username: Optional[str] = None,
+                   ) -> None:
+        """Drop user from cache, call it on any change of user data
+
+        Args:
+            user_id (Optional[int], optional): user id. Defaults to None.
+            username (Optional[str], optional): username. Defaults to None.
+        """
+        for user in (self._by_id.get(user_id), self._by_username.get(username)):
+            if user is not None:
+                self._by_id.delete(user.id)
+                self._by_username.delete(user.username)
+        self._by_id.delete(user_id)
+        self._by_username.delete(username)
+
+    def clear(self) -> None:
+        """Drop all users from cache"""
+        self._by_id.clear()
+        self._by_username.clear()
+
+
+# to stay under SQLite limit of variables in one query
+LOAD_CHUNK_SIZE = 500
+
+# shared between requests
+users_cache = UsersCache(settings.user_cache_ttl, settings.user_cache_size)
+
+
+class UserLoader:
+    """DataLoader-like helper: load many users by one query instead of one per row
+
+    Usage:
+        users = loader.load_many(operation.user_id for operation in operations)
+        user = users.get(operation.user_id)
+    """
+    def __init__(self, session: Session = Depends(get_session)):
+        self.session = session
+
+    def load(self, user_id: int) -> Optional[ModelsUser]:
+        """Load one user
+
+        Args:
+            user_id (int): user id
+
+        Returns:
+            Optional[ModelsUser]: user or None if there is no such user
+        """
+        return self.load_many([user_id]).get(user_id)
+
+    def load_many(self, user_ids: Iterable[Optional[int]]) -> dict[int, ModelsUser]:
+        """Load users from cache, missed ones by `IN` queries of LOAD_CHUNK_SIZE
+
+        Args:
+            user_ids (Iterable[Optional[int]]): user ids, duplicates and None are
+            skipped
+
+        Returns:
+            dict[int, ModelsUser]: found users by id
+        """
+        users = {}
+        missed = set()
+        for user_id in set(user_ids):
+            if user_id is None:
+                continue
+            user = users_cache.get_by_id(user_id)
+            if user is None:
+                missed.add(user_id)
+            else:
+                users[user_id] = user
+
+        missed_ids = sorted(missed)
+        for start in range(0, len(missed_ids), LOAD_CHUNK_SIZE):
+            rows = (
+                self.session
+                .query(TablesUser)
+                .filter(TablesUser.id.in_(missed_ids[start:start + LOAD_CHUNK_SIZE]))
+                .all()
+            )
+            for row in rows:
+                user = ModelsUser.from_orm(row)
+                users_cache.set(user)
+                users[user.id] = user
+        return users
@@ -14,6 +14,26 @@ class Settings(BaseSettings):
     jwt_algorithm: str = 'HS256'
     jwt_expiration: int = 3600  # in seconds
 
+    # keep amounts as integer minor units (cents) in services and aggregates,
+    # requires `amount_minor` column (alembic revision 9c0952065f6d)
+    money_minor_units: bool = False
+
+    # currency of operations without currency and of `fx_rates`
+    base_currency: str = 'RUB'
+    fx_cache_ttl: int = 3600  # in seconds
+
+    # compressed files of archived operations
+    archive_dir: str = './src/archive'
+    # operations older than this are archived by `database.archive_operations`
+    archive_after_days: int = 730
+
+    user_cache_enabled: bool = True
+    user_cache_ttl: int = 300  # in seconds
+    user_cache_size: int = 10000
+
+    # responses smaller than this are sent uncompressed
+    compression_minimum_size: int = 500  # in bytes
+
     class Config:
         """Config to set .env file uploading"""
         env_file = './src/app/.env'
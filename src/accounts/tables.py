@@ -1,6 +1,7 @@
 # pylint: disable=missing-module-docstring
 from sqlalchemy import (
-    Column, Integer, Date, MetaData, String, Numeric, Text, ForeignKey)
+    BigInteger, Column, Integer, Date, Index, MetaData, String, Numeric, Text,
+    ForeignKey, UniqueConstraint)
 from sqlalchemy.ext.declarative import declarative_base
 
 
@@ -28,10 +29,68 @@ class User(Base):
 class Operation(Base):
     """Table to store operations info"""
     __tablename__ = 'operations'
+    __table_args__ = (
+        # to read operations of user by dates, e.g. to archive them
+        Index('ix_operations_user_id_date', 'user_id', 'date'),
+        # ids of archived operations must not be given to new ones
+        {'sqlite_autoincrement': True},
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.id'))
     date = Column(Date)
     kind = Column(String)
     amount = Column(Numeric(10, 2))
+    # the same amount in minor units (cents), used if `settings.money_minor_units`
+    amount_minor = Column(BigInteger)
+    currency = Column(String(3))
     description = Column(String, nullable=True)
+
+
+class FxRate(Base):
+    """Table to store exchange rates: price of one unit of `currency` in
+    `settings.base_currency` on `date`"""
+    __tablename__ = 'fx_rates'
+
+    date = Column(Date, primary_key=True)
+    currency = Column(String(3), primary_key=True)
+    rate = Column(Numeric(18, 8), nullable=False)
+
+
+class FxRatesVersion(Base):
+    """Table to store one row with version of `fx_rates`, it is changed with rates
+    to let services drop cached rates"""
+    __tablename__ = 'fx_rates_version'
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
+
+
+class ArchiveSegment(Base):
+    """Table to store compressed files with archived operations of user for year"""
+    __tablename__ = 'archive_segments'
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id'))
+    year = Column(Integer, nullable=False)
+    # relative to `settings.archive_dir`
+    path = Column(Text, nullable=False, unique=True)
+    min_date = Column(Date, nullable=False)
+    max_date = Column(Date, nullable=False)
+    rows = Column(Integer, nullable=False)
+
+
+class OperationSummary(Base):
+    """Table to store yearly sums of archived operations"""
+    __tablename__ = 'operation_summaries'
+    __table_args__ = (UniqueConstraint('user_id', 'year', 'kind', 'currency'),)
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id'))
+    year = Column(Integer, nullable=False)
+    kind = Column(String, nullable=False)
+    currency = Column(String(3), nullable=False)
+    count = Column(Integer, nullable=False)
+    amount_minor = Column(BigInteger, nullable=False)
+    # converted to `settings.base_currency` by rate on date of each operation
+    amount_base_minor = Column(BigInteger, nullable=False)